@@ -122,7 +122,7 @@ REQUIREMENTS:
 -------------
 - Must be run from within a git repository
 - Git must be available in PATH
-- Python 3.7+ (uses pathlib, subprocess, typing)
+- Python 3.7+ (uses subprocess, threading, concurrent.futures, typing)
 - The specified git references must exist and be accessible
 
 ERROR HANDLING:
@@ -136,12 +136,88 @@ The script gracefully handles:
 """
 
 import argparse
+import fnmatch
 import os
 import re
 import subprocess
 import sys
-from pathlib import Path
-from typing import NamedTuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, NamedTuple, TextIO
+
+# Read-only git subcommands whose output can't change during a run
+CACHEABLE_COMMANDS = {"rev-parse", "show", "symbolic-ref"}
+CACHEABLE_DIFF_OPTIONS = {"--numstat"}
+
+# Syntax highlighting language for each known source/text extension
+LANGUAGE_BY_EXTENSION = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".tsx": "tsx",
+    ".jsx": "jsx",
+    ".java": "java",
+    ".cpp": "cpp",
+    ".c": "c",
+    ".h": "c",
+    ".hpp": "cpp",
+    ".rs": "rust",
+    ".go": "go",
+    ".rb": "ruby",
+    ".php": "php",
+    ".sql": "sql",
+    ".html": "html",
+    ".css": "css",
+    ".scss": "scss",
+    ".json": "json",
+    ".xml": "xml",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".toml": "toml",
+    ".md": "markdown",
+    ".sh": "bash",
+    ".dockerfile": "dockerfile",
+}
+
+# Extensions that are always treated as text or as binary, without asking git
+TEXT_EXTS = frozenset(LANGUAGE_BY_EXTENSION)
+BINARY_EXTS = frozenset(
+    {
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".gif",
+        ".ico",
+        ".svg",
+        ".bmp",
+        ".woff",
+        ".woff2",
+        ".ttf",
+        ".eot",
+        ".otf",
+        ".pdf",
+        ".zip",
+        ".tar",
+        ".gz",
+        ".rar",
+        ".7z",
+        ".exe",
+        ".dll",
+        ".so",
+        ".dylib",
+        ".a",
+        ".lib",
+        ".mp3",
+        ".mp4",
+        ".avi",
+        ".mov",
+        ".wav",
+        ".lock",  # treat lock files as binary
+    }
+)
+
+# How much of a file is inspected for null bytes when deciding if it is binary
+BINARY_SNIFF_BYTES = 1000
 
 
 class FileChange(NamedTuple):
@@ -150,6 +226,15 @@ class FileChange(NamedTuple):
     status: str  # A, M, D, R, C, etc.
     path: str
     old_path: str | None = None  # For renames
+    suffix: str = ""  # Lowercased extension of path, computed once while parsing
+    similarity: int | None = None  # Rename/copy score from git, 100 means content is unchanged
+
+
+class Blob(NamedTuple):
+    """A file's content as read from git cat-file."""
+
+    size: int  # Full size in bytes, from the cat-file header
+    data: bytes  # Whole content, or only the first BINARY_SNIFF_BYTES when the size limit was exceeded
 
 
 class GitError(Exception):
@@ -176,7 +261,7 @@ class PRSummaryGenerator:
         self.output_file = output_file
         self.max_file_size = max_file_size
         self.context_lines = context_lines
-        self.include_extensions = include_extensions or set()
+        self.include_extensions = {ext.lower() for ext in include_extensions or ()}
         self.exclude_patterns = exclude_patterns or {
             "__pycache__",
             "*.pyc",
@@ -207,169 +292,385 @@ class PRSummaryGenerator:
             "*.so",
         }
 
+        # Compile exclude patterns once: globs become one regex, the rest are substring checks
+        glob_patterns = {p for p in self.exclude_patterns if "*" in p or "?" in p}
+        self._exclude_re = (
+            re.compile("|".join(fnmatch.translate(p) for p in sorted(glob_patterns))) if glob_patterns else None
+        )
+        self._exclude_substrs = tuple(set(self.exclude_patterns) - glob_patterns)
+
+        # Per-run caches for repeated lookups
+        self._cmd_cache: dict[tuple[str, ...], str] = {}
+        self._binary_cache: dict[tuple[str, str], bool] = {}
+        self._numstat: dict[str, tuple[str, str]] | None = None
+        self._raw_changes: list[FileChange] | None = None
+        self._diff_output: bytes | None = None
+        self._patch_spans: dict[str, tuple[int, int]] | None = None
+
         # Validate git repository
         self._ensure_git_repo()
 
-    def _run_git_command(self, cmd: list[str], allow_empty: bool = False) -> str:
-        """Run a git command and return the output."""
+        # Persistent blob reader, so file contents don't cost a subprocess each
+        self._catfile = subprocess.Popen(["git", "cat-file", "--batch"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def close(self):
+        """Shut down the background git cat-file process."""
+        catfile = getattr(self, "_catfile", None)
+        if catfile is None:
+            return
+        self._catfile = None
         try:
-            result = subprocess.run(["git"] + cmd, capture_output=True, text=True, check=True, cwd=os.getcwd())
-            return result.stdout.strip()
+            catfile.stdin.close()
+        except OSError:
+            pass
+        try:
+            catfile.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            catfile.kill()
+            catfile.wait()
+        catfile.stdout.close()
+
+    def __del__(self):
+        self.close()
+
+    def _run_git_command(self, cmd: list[str], allow_empty: bool = False, binary: bool = False) -> str | bytes:
+        """Run a git command and return the output (raw, unstripped bytes if binary is set)."""
+        cacheable = not binary and (
+            cmd[0] in CACHEABLE_COMMANDS or (cmd[0] == "diff" and not CACHEABLE_DIFF_OPTIONS.isdisjoint(cmd))
+        )
+        if cacheable and tuple(cmd) in self._cmd_cache:
+            return self._cmd_cache[tuple(cmd)]
+
+        try:
+            result = subprocess.run(["git"] + cmd, capture_output=True, text=not binary, check=True)
         except subprocess.CalledProcessError as e:
             if allow_empty and e.returncode == 1 and not e.stderr:
-                return ""
-            raise GitError(f"Git command failed: {' '.join(cmd)}\nError: {e.stderr}")
+                return b"" if binary else ""
+            stderr = os.fsdecode(e.stderr) if binary else e.stderr
+            raise GitError(f"Git command failed: {' '.join(cmd)}\nError: {stderr}")
+
+        if binary:
+            return result.stdout
+
+        output = result.stdout.strip()
+        if cacheable:
+            self._cmd_cache[tuple(cmd)] = output
+        return output
+
+    def _read_blob(self, ref: str, file_path: str, limit: int | None = None) -> Blob:
+        """Read a file at a specific ref via git cat-file, keeping only a preview if it exceeds limit."""
+        if self._catfile is None:
+            raise GitError("git cat-file process is not running")
+        if "\n" in file_path:
+            # cat-file requests are newline-terminated, so such a path can't be asked for
+            raise GitError(f"Could not read {ref}:{file_path!r}")
 
-    def _ensure_git_repo(self):
-        """Ensure we're in a git repository and refs exist."""
         try:
-            self._run_git_command(["rev-parse", "--git-dir"])
-        except GitError:
-            raise GitError("Not in a git repository")
+            self._catfile.stdin.write(os.fsencode(f"{ref}:{file_path}\n"))
+            self._catfile.stdin.flush()
+        except OSError as e:
+            raise GitError(f"git cat-file failed: {e}")
+
+        blob = self._read_blob_response(limit)
+        if blob is None:
+            raise GitError(f"Could not read {ref}:{file_path}")
+        return blob
+
+    def _read_blobs(self, ref: str, file_paths: list[str], limit: int | None = None) -> Iterator[Blob | None]:
+        """Read many files at a specific ref in one pipelined git cat-file round-trip.
+
+        Requests are written from a background thread while responses are consumed here, in order.
+        Yields None for paths that could not be read; those are final, since no other cat-file
+        request may be made until the batch has been fully consumed.
+        """
+        if self._catfile is None:
+            raise GitError("git cat-file process is not running")
+
+        stdin = self._catfile.stdin
+        # Paths containing a newline would split into two requests, so they are never sent
+        requested = [file_path for file_path in file_paths if "\n" not in file_path]
+
+        def write_requests():
+            try:
+                for file_path in requested:
+                    stdin.write(os.fsencode(f"{ref}:{file_path}\n"))
+                stdin.flush()
+            except OSError:
+                pass
+
+        writer = threading.Thread(target=write_requests, daemon=True)
+        writer.start()
+        remaining = len(requested)
+        try:
+            for file_path in file_paths:
+                if "\n" in file_path:
+                    yield None
+                    continue
+                remaining -= 1
+                yield self._read_blob_response(limit)
+        finally:
+            # Drain unread responses so the next request lines up with its answer
+            while remaining:
+                remaining -= 1
+                self._read_blob_response(0)
+            writer.join()
+
+    def _read_blob_response(self, limit: int | None = None) -> Blob | None:
+        """Read one response from git cat-file, or None if the object couldn't be read.
+
+        Bodies larger than limit are skipped after the first BINARY_SNIFF_BYTES instead of being held in memory.
+        """
+        stdout = self._catfile.stdout
+        try:
+            line = stdout.readline()
+        except OSError as e:
+            raise GitError(f"git cat-file failed: {e}")
+        if not line:
+            raise GitError("git cat-file exited unexpectedly")
+        header = line.rstrip(b"\n")
+
+        # "<name> missing" and "<name> ambiguous" have no body. The requested name is echoed back and may
+        # contain spaces or undecodable bytes, so only the last token is looked at, without decoding.
+        if header.rsplit(b" ", 1)[-1] in (b"missing", b"ambiguous"):
+            return None
 
-        # Validate refs exist
+        # Otherwise it is "<sha> <type> <size>"
         try:
-            self._run_git_command(["rev-parse", "--verify", self.base_ref])
-            self._run_git_command(["rev-parse", "--verify", self.current_ref])
+            _, object_type, size = header.split(b" ")
+            size = int(size)
+        except ValueError:
+            raise GitError(f"Unexpected git cat-file response: {header!r}")
+
+        # Any other object type (a tree, or a commit) still has a body, which must be consumed
+        if object_type != b"blob":
+            limit = 0
+        # An empty or short read means cat-file closed its output mid-object
+        if limit is None or size <= limit:
+            data = stdout.read(size)
+            if len(data) != size:
+                raise GitError("git cat-file output ended mid-object")
+        else:
+            data = stdout.read(min(size, BINARY_SNIFF_BYTES))
+            remaining = size - len(data)
+            while remaining:
+                chunk = stdout.read(min(remaining, 1 << 16))
+                if not chunk:
+                    raise GitError("git cat-file output ended mid-object")
+                remaining -= len(chunk)
+        stdout.read(1)  # trailing newline
+        return Blob(size, data) if object_type == b"blob" else None
+
+    def _ensure_git_repo(self):
+        """Ensure we're in a git repository and refs exist."""
+        # One rev-parse answers both questions; "--" forces both refs to be read as revisions
+        try:
+            output = self._run_git_command(
+                ["rev-parse", "--git-dir", f"{self.base_ref}^{{commit}}", f"{self.current_ref}^{{commit}}", "--"]
+            )
         except GitError as e:
+            if "not a git repository" in str(e):
+                raise GitError("Not in a git repository")
             raise GitError(f"Invalid git reference: {e}")
 
-    def _should_include_file(self, file_path: str) -> bool:
+        lines = output.splitlines()
+        self._base_sha = lines[1]
+        self._current_sha = lines[2]
+
+    def _should_include_file(self, change: FileChange) -> bool:
         """Determine if a file should be included in the summary."""
-        path = Path(file_path)
+        file_path = change.path
 
         # Check exclude patterns
-        for pattern in self.exclude_patterns:
-            if pattern.startswith("*"):
-                if file_path.endswith(pattern[1:]):
-                    return False
-            elif pattern in file_path:
-                return False
+        if self._exclude_re and self._exclude_re.match(file_path):
+            return False
+        if any(pattern in file_path for pattern in self._exclude_substrs):
+            return False
 
         # Check include extensions (if specified)
         if self.include_extensions:
-            return path.suffix in self.include_extensions
+            return change.suffix in self.include_extensions
 
         return True
 
-    def _is_binary_file(self, file_path: str, ref: str) -> bool:
-        """Check if a file is binary at a specific git ref."""
-        try:
-            # Check file extension first for common binary types
-            path = Path(file_path)
-            binary_extensions = {
-                ".jpg",
-                ".jpeg",
-                ".png",
-                ".gif",
-                ".ico",
-                ".svg",
-                ".bmp",
-                ".woff",
-                ".woff2",
-                ".ttf",
-                ".eot",
-                ".otf",
-                ".pdf",
-                ".zip",
-                ".tar",
-                ".gz",
-                ".rar",
-                ".7z",
-                ".exe",
-                ".dll",
-                ".so",
-                ".dylib",
-                ".a",
-                ".lib",
-                ".mp3",
-                ".mp4",
-                ".avi",
-                ".mov",
-                ".wav",
-                ".lock",  # treat lock files as binary
-            }
-            if path.suffix.lower() in binary_extensions:
-                return True
+    def _is_binary_file(self, change: FileChange, ref: str, blob: Blob | None = None, fetch: bool = True) -> bool:
+        """Check if a file is binary at a specific git ref, optionally using an already-read blob.
+
+        With fetch=False the blob is final: a missing one is never re-read from git.
+        """
+        key = (ref, change.path)
+        if key not in self._binary_cache:
+            self._binary_cache[key] = self._check_binary_file(change, ref, blob, fetch)
+        return self._binary_cache[key]
+
+    def _check_binary_file(self, change: FileChange, ref: str, blob: Blob | None = None, fetch: bool = True) -> bool:
+        """Inspect a file at a specific git ref to decide whether it is binary."""
+        file_path = change.path
 
-            # Use git to check if file is binary
-            result = self._run_git_command(["diff", "--numstat", f"{ref}^", ref, "--", file_path], allow_empty=True)
-            if result and result.split("\t")[0] == "-":
-                return True
+        # Known extensions decide without touching git
+        if change.suffix in BINARY_EXTS:
+            return True
+        if change.suffix in TEXT_EXTS:
+            return False
 
-            # Additional check: try to read a small portion of the file
-            content = self._run_git_command(["show", f"{ref}:{file_path}"], allow_empty=True)
-            if content:
+        # The range's numstat table is authoritative: git reports binary files as "-\t-"
+        try:
+            counts = self._get_numstat().get(file_path)
+        except GitError:
+            counts = None
+        if counts is not None:
+            return counts == ("-", "-")
+
+        try:
+            # Not in the diff (or numstat failed): look at a small portion of the file
+            if blob is None and fetch:
+                blob = self._read_blob(ref, file_path, limit=BINARY_SNIFF_BYTES)
+            if blob is not None and blob.data:
                 # Check for null bytes (common in binary files)
-                return "\0" in content[:1000]
+                return b"\0" in blob.data[:BINARY_SNIFF_BYTES]
 
         except GitError:
             pass
 
         return False
 
-    def _get_file_changes(self) -> list[FileChange]:
-        """Get list of changed files between refs."""
-        diff_output = self._run_git_command(["diff", "--name-status", f"{self.base_ref}...{self.current_ref}"])
-
-        changes = []
-        for line in diff_output.splitlines():
-            if not line.strip():
+    def _get_numstat(self) -> dict[str, tuple[str, str]]:
+        """Get (added, deleted) line counts for every changed file, keyed by new path."""
+        if self._numstat is None:
+            output = self._run_git_command(
+                ["diff", "--numstat", "-z", f"{self.base_ref}...{self.current_ref}"], binary=True
+            )
+            self._numstat = {}
+
+            # Records are "<add>\t<del>\t<path>\0", or "<add>\t<del>\t\0<old>\0<new>\0" for renames/copies
+            fields = iter(output.split(b"\0"))
+            for record in fields:
+                if not record:
+                    continue
+                added, deleted, file_path = record.split(b"\t", 2)
+                if not file_path:
+                    next(fields, None)  # old path
+                    file_path = next(fields, b"")
+                self._numstat[os.fsdecode(file_path)] = (added.decode(), deleted.decode())
+
+        return self._numstat
+
+    def _load_diff(self):
+        """Load the file list and every per-file patch from a single git diff."""
+        output = self._run_git_command(
+            [
+                "diff",
+                f"--unified={self.context_lines}",
+                "-z",
+                "--raw",
+                "--patch",
+                f"{self.base_ref}...{self.current_ref}",
+            ],
+            binary=True,
+        )
+        self._raw_changes = []
+        self._diff_output = output
+        self._patch_spans = {}
+
+        # Raw records come first as NUL-separated fields, then an empty field, then the patch text.
+        # Paths are decoded with os.fsdecode so undecodable names still round-trip to git.
+        raw_end = output.find(b"\0\0")
+        if raw_end == -1:
+            raw_end = len(output)
+        raw_statuses = []
+        fields = iter(output[:raw_end].split(b"\0"))
+        for header in fields:
+            if not header.startswith(b":"):
                 continue
 
-            parts = line.split("\t")
-            status = parts[0]
+            status = header.rsplit(b" ", 1)[-1].decode()
+            raw_statuses.append(status)
 
             if status.startswith("R"):  # Rename
-                old_path = parts[1]
-                new_path = parts[2]
-                changes.append(FileChange("R", new_path, old_path))
+                old_path = os.fsdecode(next(fields))
+                new_path = os.fsdecode(next(fields))
+                self._raw_changes.append(
+                    FileChange("R", new_path, old_path, os.path.splitext(new_path)[1].lower(), int(status[1:] or 0))
+                )
             elif status.startswith("C"):  # Copy
-                old_path = parts[1]
-                new_path = parts[2]
-                changes.append(FileChange("C", new_path, old_path))
-            else:  # A, M, D
-                file_path = parts[1]
-                changes.append(FileChange(status, file_path))
-
-        # Filter files
-        return [change for change in changes if self._should_include_file(change.path)]
-
-    def _get_file_content(self, file_path: str, ref: str) -> str | None:
-        """Get file content at a specific ref."""
+                old_path = os.fsdecode(next(fields))
+                new_path = os.fsdecode(next(fields))
+                self._raw_changes.append(
+                    FileChange("C", new_path, old_path, os.path.splitext(new_path)[1].lower(), int(status[1:] or 0))
+                )
+            else:  # A, M, D, T
+                file_path = os.fsdecode(next(fields))
+                self._raw_changes.append(FileChange(status, file_path, None, os.path.splitext(file_path)[1].lower()))
+
+        # Patches follow the raw records in the same order; a type change is split into a delete and an add.
+        # Only each block's offsets are recorded; _get_file_diff decodes the ones that are actually rendered.
+        boundary = b"\ndiff --git "
+        starts = []
+        pos = raw_end + 2
+        while pos < len(output):
+            starts.append(pos)
+            next_pos = output.find(boundary, pos)
+            pos = len(output) if next_pos == -1 else next_pos + 1
+        starts.append(len(output))
+
+        blocks = iter(zip(starts, starts[1:]))
+        for change, status in zip(self._raw_changes, raw_statuses):
+            start, end = next(blocks, (0, 0))
+            if status == "T":
+                end = next(blocks, (start, end))[1]
+            self._patch_spans[change.path] = (start, end)
+
+    def _get_file_changes(self) -> list[FileChange]:
+        """Get list of changed files between refs."""
+        if self._raw_changes is None:
+            self._load_diff()
+
+        # Filter files, sorted once so every section can list them as-is
+        changes = [change for change in self._raw_changes if self._should_include_file(change)]
+        changes.sort(key=lambda c: c.path)
+        return changes
+
+    def _get_file_content(self, file_path: str, ref: str, blob: Blob | None = None, fetch: bool = True) -> bytes | None:
+        """Get raw file content at a specific ref, or None if it is too large or unreadable.
+
+        With fetch=False the blob is final: a missing one is never re-read from git.
+        """
         try:
-            content = self._run_git_command(["show", f"{ref}:{file_path}"])
+            if blob is None:
+                if not fetch:
+                    return None
+                blob = self._read_blob(ref, file_path, limit=self.max_file_size)
 
-            # Check file size
-            if len(content.encode("utf-8")) > self.max_file_size:
+            # Check file size (known from the cat-file header, even when the body was skipped)
+            if blob.size > self.max_file_size:
                 return None
 
-            return content
+            return blob.data.strip()
         except GitError:
             return None
 
-    def _get_file_diff(self, file_path: str, old_path: str | None = None) -> str:
-        """Get diff for a modified file."""
-        try:
-            cmd = ["diff", f"--unified={self.context_lines}", f"{self.base_ref}...{self.current_ref}"]
-            if old_path:  # Handle renames
-                cmd.extend(["--", old_path, file_path])
-            else:
-                cmd.extend(["--", file_path])
-
-            return self._run_git_command(cmd, allow_empty=True)
-        except GitError:
+    def _get_file_diff(self, file_path: str) -> str:
+        """Get diff for a modified or renamed file, keyed by its new path."""
+        if self._patch_spans is None:
+            self._load_diff()
+        span = self._patch_spans.get(file_path)
+        if span is None:
             return ""
+        # Decoded straight out of a memoryview, so the block isn't copied as bytes first
+        start, end = span
+        return str(memoryview(self._diff_output)[start:end], "utf-8", "replace").strip()
 
     def _get_commit_info(self) -> dict[str, str]:
         """Get information about the commit range."""
         try:
-            base_commit = self._run_git_command(["rev-parse", "--short", self.base_ref])
-            current_commit = self._run_git_command(["rev-parse", "--short", self.current_ref])
+            # git show drops duplicates, so a single line means both refs are the same commit
+            short_shas = self._run_git_command(["show", "-s", "--format=%h", self._base_sha, self._current_sha])
+            lines = short_shas.splitlines()
+            base_commit = lines[0]
+            current_commit = lines[-1]
 
             # Get branch names if possible
             try:
-                current_branch = self._run_git_command(["branch", "--show-current"])
+                current_branch = self._run_git_command(["symbolic-ref", "--short", "HEAD"])
             except GitError:
                 current_branch = self.current_ref
 
@@ -385,295 +686,214 @@ class PRSummaryGenerator:
 
     def _get_diff_stats(self) -> dict[str, int]:
         """Get diff statistics."""
+        stats_dict = {"files": 0, "insertions": 0, "deletions": 0}
         try:
-            stats = self._run_git_command(["diff", "--stat", f"{self.base_ref}...{self.current_ref}"])
-
-            # Parse the summary line (e.g., "5 files changed, 123 insertions(+), 45 deletions(-)")
-            lines = stats.splitlines()
-            if lines:
-                summary = lines[-1]
-                stats_dict = {"files": 0, "insertions": 0, "deletions": 0}
-
-                if "file" in summary:
-                    files_match = re.search(r"(\d+) files? changed", summary)
-                    if files_match:
-                        stats_dict["files"] = int(files_match.group(1))
-
-                if "insertion" in summary:
-                    ins_match = re.search(r"(\d+) insertions?\(\+\)", summary)
-                    if ins_match:
-                        stats_dict["insertions"] = int(ins_match.group(1))
-
-                if "deletion" in summary:
-                    del_match = re.search(r"(\d+) deletions?\(\-\)", summary)
-                    if del_match:
-                        stats_dict["deletions"] = int(del_match.group(1))
-
-                return stats_dict
+            # The numstat table is already loaded for binary detection, so totals don't need another git diff.
+            # Binary files count as changed but show "-" for their line counts, as in --shortstat.
+            numstat = self._get_numstat()
         except GitError:
-            pass
+            return stats_dict
 
-        return {"files": 0, "insertions": 0, "deletions": 0}
+        stats_dict["files"] = len(numstat)
+        for added, deleted in numstat.values():
+            if added != "-":
+                stats_dict["insertions"] += int(added)
+                stats_dict["deletions"] += int(deleted)
 
-    def _format_file_extension(self, file_path: str) -> str:
-        """Get appropriate language identifier for syntax highlighting."""
-        ext = Path(file_path).suffix.lower()
-
-        ext_map = {
-            ".py": "python",
-            ".js": "javascript",
-            ".ts": "typescript",
-            ".tsx": "tsx",
-            ".jsx": "jsx",
-            ".java": "java",
-            ".cpp": "cpp",
-            ".c": "c",
-            ".h": "c",
-            ".hpp": "cpp",
-            ".rs": "rust",
-            ".go": "go",
-            ".rb": "ruby",
-            ".php": "php",
-            ".sql": "sql",
-            ".html": "html",
-            ".css": "css",
-            ".scss": "scss",
-            ".json": "json",
-            ".xml": "xml",
-            ".yaml": "yaml",
-            ".yml": "yaml",
-            ".toml": "toml",
-            ".md": "markdown",
-            ".sh": "bash",
-            ".dockerfile": "dockerfile",
-        }
+        return stats_dict
 
-        return ext_map.get(ext, "")
+    def _format_file_extension(self, change: FileChange) -> str:
+        """Get appropriate language identifier for syntax highlighting."""
+        return LANGUAGE_BY_EXTENSION.get(change.suffix, "")
 
     def _generate_summary_section(
-        self, changes: list[FileChange], commit_info: dict[str, str], stats: dict[str, int]
-    ) -> str:
-        """Generate the summary section of the markdown."""
-        added = [c for c in changes if c.status == "A"]
-        modified = [c for c in changes if c.status == "M"]
-        deleted = [c for c in changes if c.status == "D"]
-        renamed = [c for c in changes if c.status == "R"]
-
-        summary = []
-        summary.append(f"# PR Changes: {commit_info.get('current_branch', commit_info.get('current_ref'))}")
-        summary.append("")
-        summary.append("This PR introduces the following changes:")
-        summary.append("")
-        summary.append("## Summary of Changes")
-        summary.append("")
+        self,
+        fh: TextIO,
+        added: list[FileChange],
+        modified: list[FileChange],
+        deleted: list[FileChange],
+        renamed: list[FileChange],
+    ):
+        """Write the summary section of the markdown."""
+        commit_info = self._get_commit_info()
+
+        fh.write(f"# PR Changes: {commit_info.get('current_branch', commit_info.get('current_ref'))}\n\n")
+        fh.write("This PR introduces the following changes:\n\n")
+        fh.write("## Summary of Changes\n\n")
 
         # File counts
         if added:
-            summary.append(f"### New Files Created ({len(added)} files):")
-            summary.append("")
-            for change in sorted(added, key=lambda x: x.path):
-                summary.append(f"- **{change.path}**")
-            summary.append("")
+            fh.write(f"### New Files Created ({len(added)} files):\n\n")
+            for change in added:
+                fh.write(f"- **{change.path}**\n")
+            fh.write("\n")
 
         if modified:
-            summary.append(f"### Modified Files ({len(modified)} files):")
-            summary.append("")
-            for change in sorted(modified, key=lambda x: x.path):
-                summary.append(f"- **{change.path}**")
-            summary.append("")
+            fh.write(f"### Modified Files ({len(modified)} files):\n\n")
+            for change in modified:
+                fh.write(f"- **{change.path}**\n")
+            fh.write("\n")
 
         if deleted:
-            summary.append(f"### Deleted Files ({len(deleted)} files):")
-            summary.append("")
-            for change in sorted(deleted, key=lambda x: x.path):
-                summary.append(f"- **{change.path}**")
-            summary.append("")
+            fh.write(f"### Deleted Files ({len(deleted)} files):\n\n")
+            for change in deleted:
+                fh.write(f"- **{change.path}**\n")
+            fh.write("\n")
 
         if renamed:
-            summary.append(f"### Renamed Files ({len(renamed)} files):")
-            summary.append("")
-            for change in sorted(renamed, key=lambda x: x.path):
-                summary.append(f"- **{change.old_path}** → **{change.path}**")
-            summary.append("")
+            fh.write(f"### Renamed Files ({len(renamed)} files):\n\n")
+            for change in renamed:
+                fh.write(f"- **{change.old_path}** → **{change.path}**\n")
+            fh.write("\n")
 
         # Statistics
+        stats = self._get_diff_stats()
         if stats["files"] > 0:
-            summary.append("### Statistics:")
-            summary.append("")
-            summary.append(f"- **Files Changed**: {stats['files']}")
+            fh.write("### Statistics:\n\n")
+            fh.write(f"- **Files Changed**: {stats['files']}\n")
             if stats["insertions"] > 0:
-                summary.append(f"- **Lines Added**: +{stats['insertions']}")
+                fh.write(f"- **Lines Added**: +{stats['insertions']}\n")
             if stats["deletions"] > 0:
-                summary.append(f"- **Lines Removed**: -{stats['deletions']}")
-            summary.append(
-                f"- **Commit Range**: {commit_info.get('base_commit', self.base_ref)}...{commit_info.get('current_commit', self.current_ref)}"
+                fh.write(f"- **Lines Removed**: -{stats['deletions']}\n")
+            fh.write(
+                f"- **Commit Range**: {commit_info.get('base_commit', self.base_ref)}...{commit_info.get('current_commit', self.current_ref)}\n"
             )
-            summary.append("")
+            fh.write("\n")
 
-        summary.append("---")
-        summary.append("")
+        fh.write("---\n\n")
 
-        return "\n".join(summary)
+    def _write_raw(self, fh: TextIO, data: bytes):
+        """Write raw bytes to a text stream, bypassing the text codec when the stream has a byte buffer."""
+        buffer = getattr(fh, "buffer", None)
+        if buffer is None:
+            fh.write(data.decode("utf-8", errors="replace"))
+            return
+        fh.flush()
+        buffer.write(data)
 
-    def _generate_new_files_section(self, added_files: list[FileChange]) -> str:
-        """Generate section for new files with full content."""
+    def _generate_new_files_section(self, fh: TextIO, added_files: list[FileChange]):
+        """Write section for new files with full content."""
         if not added_files:
-            return ""
+            return
 
-        sections = []
-        sections.append("## New Files")
-        sections.append("")
+        fh.write("## New Files\n\n")
 
-        for change in sorted(added_files, key=lambda x: x.path):
-            if self._is_binary_file(change.path, self.current_ref):
-                sections.append(f"### {change.path} (Binary File)")
-                sections.append("")
-                sections.append("*Binary file - content not shown*")
-                sections.append("")
+        blobs = self._read_blobs(self.current_ref, [change.path for change in added_files], limit=self.max_file_size)
+        # Blobs from the pipelined batch are final; re-reading one mid-batch would misalign the stream
+        for change, blob in zip(added_files, blobs):
+            if self._is_binary_file(change, self.current_ref, blob, fetch=False):
+                fh.write(f"### {change.path} (Binary File)\n\n")
+                fh.write("*Binary file - content not shown*\n\n")
                 continue
 
-            content = self._get_file_content(change.path, self.current_ref)
+            content = self._get_file_content(change.path, self.current_ref, blob, fetch=False)
             if content is None:
-                sections.append(f"### {change.path} (File too large)")
-                sections.append("")
-                sections.append(f"*File exceeds maximum size limit of {self.max_file_size} bytes*")
-                sections.append("")
+                fh.write(f"### {change.path} (File too large)\n\n")
+                fh.write(f"*File exceeds maximum size limit of {self.max_file_size} bytes*\n\n")
                 continue
 
-            lang = self._format_file_extension(change.path)
-            sections.append(f"### {change.path}")
-            sections.append("")
-            sections.append(f"```{lang}")
-            sections.append(content)
-            sections.append("```")
-            sections.append("")
-
-        return "\n".join(sections)
+            lang = self._format_file_extension(change)
+            fh.write(f"### {change.path}\n\n")
+            fh.write(f"```{lang}\n")
+            self._write_raw(fh, content)
+            fh.write("\n```\n\n")
 
-    def _generate_modified_files_section(self, modified_files: list[FileChange]) -> str:
-        """Generate section for modified files with diffs."""
+    def _generate_modified_files_section(self, fh: TextIO, modified_files: list[FileChange]):
+        """Write section for modified files with diffs."""
         if not modified_files:
-            return ""
+            return
 
-        sections = []
-        sections.append("## Modified Files")
-        sections.append("")
+        fh.write("## Modified Files\n\n")
 
-        for change in sorted(modified_files, key=lambda x: x.path):
-            if self._is_binary_file(change.path, self.current_ref):
-                sections.append(f"### {change.path} (Binary File)")
-                sections.append("")
-                sections.append("*Binary file modified - diff not shown*")
-                sections.append("")
+        for change in modified_files:
+            if self._is_binary_file(change, self.current_ref):
+                fh.write(f"### {change.path} (Binary File)\n\n")
+                fh.write("*Binary file modified - diff not shown*\n\n")
                 continue
 
             diff = self._get_file_diff(change.path)
             if not diff:
-                sections.append(f"### {change.path}")
-                sections.append("")
-                sections.append("*No diff available*")
-                sections.append("")
+                fh.write(f"### {change.path}\n\n")
+                fh.write("*No diff available*\n\n")
                 continue
 
-            sections.append(f"### {change.path}")
-            sections.append("")
-            sections.append("```diff")
-            sections.append(diff)
-            sections.append("```")
-            sections.append("")
-
-        return "\n".join(sections)
+            fh.write(f"### {change.path}\n\n")
+            fh.write("```diff\n")
+            fh.write(diff)
+            fh.write("\n```\n\n")
 
-    def _generate_other_changes_section(self, deleted_files: list[FileChange], renamed_files: list[FileChange]) -> str:
-        """Generate section for deletions and renames."""
+    def _generate_other_changes_section(
+        self, fh: TextIO, deleted_files: list[FileChange], renamed_files: list[FileChange]
+    ):
+        """Write section for deletions and renames."""
         if not deleted_files and not renamed_files:
-            return ""
+            return
 
-        sections = []
-        sections.append("## Other Changes")
-        sections.append("")
+        fh.write("## Other Changes\n\n")
 
         if deleted_files:
-            sections.append("### Deleted Files")
-            sections.append("")
-            for change in sorted(deleted_files, key=lambda x: x.path):
-                sections.append(f"- **{change.path}** - File removed")
-            sections.append("")
+            fh.write("### Deleted Files\n\n")
+            for change in deleted_files:
+                fh.write(f"- **{change.path}** - File removed\n")
+            fh.write("\n")
 
         if renamed_files:
-            sections.append("### Renamed Files")
-            sections.append("")
-            for change in sorted(renamed_files, key=lambda x: x.path):
-                diff = self._get_file_diff(change.path, change.old_path)
-                if diff and not diff.startswith("similarity index 100%"):
-                    sections.append(f"- **{change.old_path}** → **{change.path}** (with modifications)")
+            fh.write("### Renamed Files\n\n")
+            for change in renamed_files:
+                # The rename score from the raw diff already says whether content changed
+                if change.similarity != 100:
+                    fh.write(f"- **{change.old_path}** → **{change.path}** (with modifications)\n")
                 else:
-                    sections.append(f"- **{change.old_path}** → **{change.path}** (renamed only)")
-            sections.append("")
-
-        return "\n".join(sections)
-
-    def generate_summary(self) -> str:
-        """Generate the complete PR summary."""
+                    fh.write(f"- **{change.old_path}** → **{change.path}** (renamed only)\n")
+            fh.write("\n")
+
+    def _generate_technical_summary_section(self, fh: TextIO):
+        """Write the placeholder technical summary section."""
+        fh.write("## Technical Summary\n\n")
+        fh.write("*This section should be filled with a high-level technical overview of the changes.*\n\n")
+        fh.write("Key technical aspects:\n")
+        fh.write("- *[Add key technical points]*\n")
+        fh.write("- *[Add architectural changes]*\n")
+        fh.write("- *[Add performance implications]*\n")
+
+    def generate_summary(self, fh: TextIO):
+        """Generate the complete PR summary, writing it to an open text stream."""
         print("Analyzing git changes...")
 
-        # Get all changes
-        changes = self._get_file_changes()
+        # Get all changes; the numstat table used for binary detection is an independent git call,
+        # so it runs on a worker thread while the combined diff loads (errors are retried on first use)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(self._get_numstat)
+            changes = self._get_file_changes()
         if not changes:
-            return "# No Changes Found\n\nNo differences detected between the specified references."
+            fh.write("# No Changes Found\n\nNo differences detected between the specified references.")
+            return
 
         print(f"Found {len(changes)} changed files")
 
-        # Get commit info and stats
-        commit_info = self._get_commit_info()
-        stats = self._get_diff_stats()
-
-        # Categorize changes
-        added_files = [c for c in changes if c.status == "A"]
-        modified_files = [c for c in changes if c.status == "M"]
-        deleted_files = [c for c in changes if c.status == "D"]
-        renamed_files = [c for c in changes if c.status == "R"]
+        # Categorize changes in one pass; each list keeps the path order of changes
+        added_files, modified_files, deleted_files, renamed_files = [], [], [], []
+        categories = {"A": added_files, "M": modified_files, "D": deleted_files, "R": renamed_files}
+        for change in changes:
+            category = categories.get(change.status)
+            if category is not None:
+                category.append(change)
 
         print(
             f"Added: {len(added_files)}, Modified: {len(modified_files)}, Deleted: {len(deleted_files)}, Renamed: {len(renamed_files)}"
         )
 
-        # Generate sections
-        summary_section = self._generate_summary_section(changes, commit_info, stats)
-        new_files_section = self._generate_new_files_section(added_files)
-        modified_files_section = self._generate_modified_files_section(modified_files)
-        other_changes_section = self._generate_other_changes_section(deleted_files, renamed_files)
-
-        # Technical summary
-        technical_summary = [
-            "## Technical Summary",
-            "",
-            "*This section should be filled with a high-level technical overview of the changes.*",
-            "",
-            "Key technical aspects:",
-            "- *[Add key technical points]*",
-            "- *[Add architectural changes]*",
-            "- *[Add performance implications]*",
-            "",
-        ]
-
-        # Combine all sections
-        result = []
-        result.append(summary_section)
-        if new_files_section:
-            result.append(new_files_section)
-        if modified_files_section:
-            result.append(modified_files_section)
-        if other_changes_section:
-            result.append(other_changes_section)
-        result.append("\n".join(technical_summary))
-
-        return "\n".join(result)
-
-    def save_summary(self, content: str):
-        """Save the summary to the output file."""
-        with open(self.output_file, "w", encoding="utf-8") as f:
-            f.write(content)
+        # Sections are written out as they are generated rather than collected in memory
+        self._generate_summary_section(fh, added_files, modified_files, deleted_files, renamed_files)
+        self._generate_new_files_section(fh, added_files)
+        self._generate_modified_files_section(fh, modified_files)
+        self._generate_other_changes_section(fh, deleted_files, renamed_files)
+        self._generate_technical_summary_section(fh)
+
+    def save_summary(self):
+        """Generate the summary straight into the output file."""
+        with open(self.output_file, "w", encoding="utf-8", errors="replace", buffering=1 << 16) as f:
+            self.generate_summary(f)
         print(f"PR summary saved to: {self.output_file}")
 
 
@@ -767,8 +987,10 @@ Examples:
         )
 
         # Generate and save summary
-        summary = generator.generate_summary()
-        generator.save_summary(summary)
+        try:
+            generator.save_summary()
+        finally:
+            generator.close()
 
         print("✓ PR summary generated successfully!")
 
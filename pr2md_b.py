@@ -51,10 +51,69 @@ Requirements:
 """
 
 import argparse
+import codecs
+import itertools
+import os
+import shutil
+import stat
 import subprocess
 import sys
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
+from typing import BinaryIO, Iterator, TextIO
+
+# Markdown code fence language for each file extension
+_LANG_MAP = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".jsx": "jsx",
+    ".tsx": "tsx",
+    ".java": "java",
+    ".cpp": "cpp",
+    ".c": "c",
+    ".h": "c",
+    ".rs": "rust",
+    ".go": "go",
+    ".rb": "ruby",
+    ".php": "php",
+    ".sh": "bash",
+    ".sql": "sql",
+    ".md": "markdown",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".json": "json",
+    ".xml": "xml",
+    ".html": "html",
+    ".css": "css",
+    ".scss": "scss",
+    ".tf": "hcl",
+}
+
+# Lock files, matched on the lowercased file name
+_LOCKFILES = frozenset(
+    {
+        "uv.lock",
+        "package-lock.json",
+        "yarn.lock",
+        "pipfile.lock",
+        "poetry.lock",
+        "pnpm-lock.yaml",
+        "cargo.lock",
+        "gemfile.lock",
+        "composer.lock",
+        "go.sum",
+    }
+)
+
+# Auto-generated files, matched on the lowercased file name's ending
+_GENERATED_SUFFIXES = (
+    ".min.js",
+    ".min.css",  # Minified files
+    ".map",  # Source maps
+)
 
 
 def run_git_command(cmd: list[str]) -> tuple[str, int]:
@@ -67,6 +126,26 @@ def run_git_command(cmd: list[str]) -> tuple[str, int]:
         return "", 1
 
 
+def run_git_stream(cmd: list[str], chunk_size: int = 1 << 16) -> Iterator[str]:
+    """Run a git command and yield its output in chunks as git produces it.
+
+    Undecodable bytes are kept as surrogate escapes so paths survive intact.
+    Raises CalledProcessError once the output is exhausted if git failed.
+    """
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+        errors="surrogateescape",
+    ) as proc:
+        while chunk := proc.stdout.read(chunk_size):
+            yield chunk
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
 def get_merge_base(branch: str) -> str | None:
     """Get the merge base between current HEAD and the specified branch."""
     output, code = run_git_command(["git", "merge-base", "HEAD", branch])
@@ -99,23 +178,17 @@ def get_current_branch() -> str:
     return f"commit:{output}" if code == 0 else "unknown"
 
 
-def get_file_changes(base_commit: str) -> tuple[list[dict], dict]:
+def get_file_changes(base_commit: str, max_diff_lines: int = 0) -> tuple[list[dict], dict]:
     """Get list of changed files and summary statistics."""
-    # Get file status
-    output, code = run_git_command(["git", "diff", "--name-status", f"{base_commit}..HEAD"])
-    if code != 0:
-        return [], {}
+    # Status, binary flag, line counts and patch for every file, from one git call
+    diffs = get_all_diffs(base_commit, max_diff_lines=max_diff_lines)
 
     files = []
     stats = {"added": 0, "modified": 0, "deleted": 0, "renamed": 0}
 
-    for line in output.split("\n"):
-        if not line.strip():
-            continue
-
-        parts = line.split("\t")
-        status = parts[0]
-        filepath = parts[1] if len(parts) > 1 else ""
+    for entry in diffs.values():
+        status = entry["status"]
+        filepath = entry["path"]
 
         if status.startswith("A"):
             file_status = "Added"
@@ -129,196 +202,299 @@ def get_file_changes(base_commit: str) -> tuple[list[dict], dict]:
         elif status.startswith("R"):
             file_status = "Renamed"
             stats["renamed"] += 1
-            if len(parts) > 2:
-                filepath = f"{parts[1]} → {parts[2]}"
+            filepath = f"{entry['old_path']} → {entry['path']}"
         else:
             file_status = f"Unknown ({status})"
 
-        files.append({"path": filepath, "status": file_status, "status_code": status})
+        files.append(
+            {
+                "path": filepath,
+                "actual_path": entry["path"],
+                "old_path": entry["old_path"],
+                "status": file_status,
+                "status_code": status,
+                "binary": entry["binary"],
+                "added": entry["added"],
+                "deleted": entry["deleted"],
+                "too_large": entry["too_large"],
+                "patch": entry["patch"],
+            }
+        )
 
     return files, stats
 
 
-def is_binary_file(filepath: str, base_commit: str) -> bool:
-    """Check if a file is binary by trying to get its diff."""
-    output, code = run_git_command(["git", "diff", "--numstat", f"{base_commit}..HEAD", "--", filepath])
+def _basename(filepath: str) -> str:
+    """Get the final component of a git path (git always uses "/" separators)."""
+    return filepath.rsplit("/", 1)[-1]
 
-    if code != 0:
-        return True
 
-    # Binary files show as "-	-	filename" in numstat
-    parts = output.split("\t")
-    return len(parts) >= 2 and parts[0] == "-" and parts[1] == "-"
+def _get_language(filepath: str) -> str:
+    """Get the code fence language for a file from its extension, read straight off the path."""
+    # The extension starts at the last dot of the final component, unless that dot begins the name
+    i = filepath.rfind(".")
+    if i <= filepath.rfind("/") + 1:
+        return ""
+    return _LANG_MAP.get(filepath[i:].lower(), "")
 
 
 def should_skip_file(filepath: str) -> bool:
     """Check if a file should be skipped (lockfiles, auto-generated files, etc.)."""
-    filename = Path(filepath).name.lower()
-
-    # Lock files
-    lockfile_patterns = [
-        "uv.lock",
-        "package-lock.json",
-        "yarn.lock",
-        "pipfile.lock",
-        "poetry.lock",
-        "pnpm-lock.yaml",
-        "cargo.lock",
-        "gemfile.lock",
-        "composer.lock",
-        "go.sum",
-    ]
-
-    # Auto-generated files
-    generated_patterns = [
-        ".min.js",
-        ".min.css",  # Minified files
-        ".map",  # Source maps
-    ]
-
-    # Check exact filename matches
-    if filename in lockfile_patterns:
-        return True
-
-    # Check suffix patterns
-    for pattern in generated_patterns:
-        if filename.endswith(pattern):
-            return True
-
-    return False
+    filename = _basename(filepath).lower()
+    return filename in _LOCKFILES or filename.endswith(_GENERATED_SUFFIXES)
+
+
+def _split_patch_blocks(head: str, chunks: Iterator[str]) -> Iterator[str]:
+    """Yield the per-file blocks of a streamed patch, each starting with its "diff --git" header.
+
+    head is the start of the patch text and chunks the rest of it. Only the block being assembled
+    is held in memory.
+    """
+    sep = "\ndiff --git "
+    pending = head
+    start = 0
+    for chunk in itertools.chain([""], chunks):
+        pending += chunk
+        pos = 0
+        i = pending.find(sep, start)
+        while i != -1:
+            yield pending[pos:i]
+            pos = i + 1
+            i = pending.find(sep, pos)
+        pending = pending[pos:]
+        # A separator may straddle the next chunk boundary
+        start = max(0, len(pending) - len(sep) + 1)
+    if pending:
+        yield pending.rstrip("\n")
+
+
+def read_patch(patch: tuple[BinaryIO, int, int]) -> str:
+    """Read a file's patch back from the spool it was written to by get_all_diffs()."""
+    spool, offset, length = patch
+    spool.seek(offset)
+    return spool.read(length).decode("utf-8", "surrogateescape")
+
+
+def get_all_diffs(base_commit: str, max_context: int = 3, max_diff_lines: int = 0) -> dict[str, dict]:
+    """Get the status, binary flag, line counts and patch of every changed file from a single git diff.
+
+    Patches are spooled to a temporary file as they stream in and referenced by (file, offset, length);
+    read one back with read_patch(). They are not kept for new files, which are shown from the working
+    tree, or for diffs changing more than max_diff_lines lines (0 for no limit), which are flagged too_large.
+    """
+    cmd = ["git", "diff", "-z", "--raw", "--numstat", "--patch", f"-U{max_context}", f"{base_commit}..HEAD"]
+    chunks = run_git_stream(cmd)
+    try:
+        # With -z the raw records come first, then one numstat record per file, then an empty field
+        # followed by the patch text. All three list the files in the same order.
+        meta = ""
+        for chunk in chunks:
+            start = max(0, len(meta) - 1)
+            meta += chunk
+            if "\0\0" in meta[start:]:
+                break
+        meta, _, patch_head = meta.partition("\0\0")
+        fields = meta.split("\0")
+
+        entries = []
+        i = 0
+        while i < len(fields) and fields[i].startswith(":"):
+            status = fields[i].rsplit(" ", 1)[-1]
+            path_count = 2 if status[0] in "RC" else 1
+            old_path = fields[i + 1] if path_count == 2 else None
+            path = fields[i + path_count]
+            entries.append(
+                {
+                    "path": path,
+                    "old_path": old_path,
+                    "status": status,
+                    "binary": False,
+                    "added": 0,
+                    "deleted": 0,
+                    "too_large": False,
+                    "patch": None,
+                }
+            )
+            i += 1 + path_count
+
+        # Numstat: "<added>\t<deleted>\t<path>", or an empty path followed by old/new paths for renames.
+        # Binary files show "-\t-".
+        for entry in entries:
+            added, deleted, path = fields[i].split("\t", 2)
+            if added == "-" and deleted == "-":
+                entry["binary"] = True
+            else:
+                entry["added"], entry["deleted"] = int(added), int(deleted)
+                entry["too_large"] = (
+                    max_diff_lines > 0 and entry["status"] != "A" and int(added) + int(deleted) > max_diff_lines
+                )
+            i += 3 if not path else 1
+
+        # Patch blocks are split off as they stream in; each "diff --git" block belongs to the next
+        # file, except that a type change is shown as a delete plus an add of the same path
+        spool = tempfile.TemporaryFile()
+        offset = 0
+        remaining = iter(entries)
+        current = None
+        pending_headers = 0
+        for block in _split_patch_blocks(patch_head, chunks):
+            if pending_headers:
+                pending_headers -= 1
+            else:
+                current = next(remaining, None)
+                pending_headers = 1 if current and current["status"] == "T" else 0
+            if current is not None and current["status"] != "A" and not current["too_large"]:
+                data = block.encode("utf-8", "surrogateescape")
+                if current["patch"] is None:
+                    current["patch"] = (spool, offset, len(data))
+                else:
+                    # Second block of a type change, rejoined with the newline the split consumed
+                    data = b"\n" + data
+                    patch_offset, length = current["patch"][1:]
+                    current["patch"] = (spool, patch_offset, length + len(data))
+                spool.write(data)
+                offset += len(data)
+    except subprocess.CalledProcessError:
+        return {}
+    except Exception as e:
+        print(f"Error running git command: {e}")
+        return {}
+    finally:
+        chunks.close()
 
+    return {entry["path"]: entry for entry in entries}
 
-def get_file_diff(filepath: str, base_commit: str, max_context: int = 3) -> str | None:
-    """Get the diff for a specific file."""
-    if is_binary_file(filepath, base_commit):
-        return None
 
-    output, code = run_git_command(["git", "diff", f"--unified={max_context}", f"{base_commit}..HEAD", "--", filepath])
+def _added_file_stub(path: str, max_file_size: int) -> str | None:
+    """Get the note to show instead of a new file's content, or None if the content can be shown.
 
-    if code != 0:
+    Missing files, symlinks and files over max_file_size bytes (0 for no limit) are caught with a
+    single lstat, without opening them.
+    """
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return "*File not found in working tree*"
+    except OSError:
+        # Let the reader report it
         return None
 
-    return output
+    if stat.S_ISLNK(st.st_mode):
+        return f"*Symlink → `{os.readlink(path)}`*"
+    if max_file_size and st.st_size > max_file_size:
+        return f"*File too large ({st.st_size} bytes); not shown inline*"
+    return None
 
 
-def get_file_content(filepath: str) -> str | None:
-    """Get the current content of a file (for new files)."""
+def _sniff_binary(path: str) -> bool:
+    """Check if a working-tree file looks binary the way git does: a NUL in its first 8 KB."""
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return f.read()
-    except Exception:
-        return None
-
+        with open(path, "rb") as f:
+            return b"\0" in f.read(8192)
+    except OSError:
+        return False
 
-def format_diff_for_markdown(diff_output: str, filepath: str, max_unchanged_lines: int = 10) -> str:
-    """Format git diff output for markdown with line skipping for large unchanged sections."""
-    if not diff_output:
-        return ""
 
-    lines = diff_output.split("\n")
+def _emit_added_file(src: str, out: TextIO) -> bool:
+    """Copy the current content of a new file into out as a fenced code block.
 
-    # Skip the git diff header lines (first 4-5 lines typically)
-    content_start = 0
-    for i, line in enumerate(lines):
+    Returns False (writing nothing) if the file can't be read, isn't UTF-8 or is empty.
+    Binary files are expected to have been filtered out by the caller.
+    """
+    try:
+        with open(src, "rb") as src_f:
+            # Validate the encoding up front so a bad byte can't leave a half-written block
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            empty = True
+            while chunk := src_f.read(1 << 20):
+                decoder.decode(chunk)
+                empty = False
+            decoder.decode(b"", final=True)
+            if empty:
+                return False
+
+            src_f.seek(0)
+            out.write(f"```{_get_language(src)}\n")
+            out.flush()
+            shutil.copyfileobj(src_f, out.buffer, length=1 << 20)
+            out.write("\n```")
+    except (OSError, UnicodeDecodeError):
+        return False
+    return True
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of text one at a time, without building a list of them."""
+    start = 0
+    while (end := text.find("\n", start)) != -1:
+        yield text[start:end]
+        start = end + 1
+    if start < len(text):
+        yield text[start:]
+
+
+def format_diff_for_markdown(diff: str, filepath: str, out: TextIO, max_unchanged_lines: int = 10) -> bool:
+    """Write a git diff to out as markdown in a single pass, skipping large unchanged sections.
+
+    Returns False (writing nothing) if the diff has no hunks.
+    """
+    lines = _iter_lines(diff)
+
+    # Skip the git diff header lines up to the first hunk
+    for line in lines:
         if line.startswith("@@"):
-            content_start = i
             break
+    else:
+        return False
 
-    if content_start == 0:
-        return ""
-
-    # Get file extension for syntax highlighting
-    ext = Path(filepath).suffix.lower()
-    lang_map = {
-        ".py": "python",
-        ".js": "javascript",
-        ".ts": "typescript",
-        ".jsx": "jsx",
-        ".tsx": "tsx",
-        ".java": "java",
-        ".cpp": "cpp",
-        ".c": "c",
-        ".h": "c",
-        ".rs": "rust",
-        ".go": "go",
-        ".rb": "ruby",
-        ".php": "php",
-        ".sh": "bash",
-        ".sql": "sql",
-        ".md": "markdown",
-        ".yaml": "yaml",
-        ".yml": "yaml",
-        ".json": "json",
-        ".xml": "xml",
-        ".html": "html",
-        ".css": "css",
-        ".scss": "scss",
-        ".tf": "hcl",
-    }
-
-    language = lang_map.get(ext, "")
-
-    # Process diff content
-    result_lines = []
+    out.write(f"```{_get_language(filepath)}\n{line}\n")
     unchanged_count = 0
-    in_unchanged_section = False
 
-    for line in lines[content_start:]:
-        if line.startswith("@@"):
-            # Hunk header
-            if unchanged_count > max_unchanged_lines and in_unchanged_section:
-                result_lines.append(f"... ({unchanged_count} lines unchanged) ...")
-            unchanged_count = 0
-            in_unchanged_section = False
-            result_lines.append(line)
-        elif line.startswith((" ", "\t")) and not line.startswith(("+", "-")):
-            # Unchanged line (context)
-            unchanged_count += 1
-            if unchanged_count <= max_unchanged_lines:
-                result_lines.append(line)
-            else:
-                in_unchanged_section = True
-        else:
-            # Changed line
-            if unchanged_count > max_unchanged_lines and in_unchanged_section:
-                result_lines.append(f"... ({unchanged_count} lines unchanged) ...")
-            unchanged_count = 0
-            in_unchanged_section = False
-            result_lines.append(line)
+    for line in lines:
+        match line[:1]:
+            case " " | "\t":
+                # Unchanged line (context)
+                unchanged_count += 1
+                if unchanged_count <= max_unchanged_lines:
+                    out.write(f"{line}\n")
+            case _:
+                # Hunk header or changed line
+                if unchanged_count > max_unchanged_lines:
+                    out.write(f"... ({unchanged_count} lines unchanged) ...\n")
+                unchanged_count = 0
+                out.write(f"{line}\n")
 
     # Handle trailing unchanged lines
-    if unchanged_count > max_unchanged_lines and in_unchanged_section:
-        result_lines.append(f"... ({unchanged_count} lines unchanged) ...")
-
-    diff_content = "\n".join(result_lines)
+    if unchanged_count > max_unchanged_lines:
+        out.write(f"... ({unchanged_count} lines unchanged) ...\n")
 
-    return f"```{language}\n{diff_content}\n```"
+    out.write("```")
+    return True
 
 
 def group_files_by_directory(files: list[dict]) -> dict[str, list[dict]]:
     """Group files by their directory."""
-    groups = {}
+    groups: defaultdict[str, list[dict]] = defaultdict(list)
 
     for file_info in files:
-        filepath = file_info["path"]
-        if " → " in filepath:  # Handle renamed files
-            filepath = filepath.split(" → ")[1]
-
-        directory = str(Path(filepath).parent)
-        if directory == ".":
-            directory = "Root"
-
-        if directory not in groups:
-            groups[directory] = []
+        filepath = file_info["actual_path"]
+        directory = filepath.rsplit("/", 1)[0] if "/" in filepath else "Root"
         groups[directory].append(file_info)
 
     return groups
 
 
-def generate_markdown_report(base_ref: str, base_commit: str, files: list[dict], stats: dict, output_file: str):
+def generate_markdown_report(
+    base_ref: str, base_commit: str, files: list[dict], stats: dict, output_file: str, max_file_size: int = 0
+):
     """Generate the complete markdown report."""
-    current_branch = get_current_branch()
-    head_commit = get_commit_hash("HEAD")[:8] if get_commit_hash("HEAD") else "unknown"
+    # The remaining git calls don't depend on each other, so the shortstat runs in the background
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        shortstat_future = pool.submit(run_git_command, ["git", "diff", "--shortstat", f"{base_commit}..HEAD"])
+        current_branch = get_current_branch()
+        head_hash = get_commit_hash("HEAD")
+    head_commit = head_hash[:8] if head_hash else "unknown"
+
     base_commit_short = base_commit[:8] if base_commit else "unknown"
 
     # Calculate total changes
@@ -328,7 +504,8 @@ def generate_markdown_report(base_ref: str, base_commit: str, files: list[dict],
     # Group files by directory
     file_groups = group_files_by_directory(files)
 
-    with open(output_file, "w", encoding="utf-8") as f:
+    # The report is written in many small pieces, so give it a large buffer to batch them into few writes
+    with open(output_file, "w", encoding="utf-8", errors="replace", buffering=1 << 20) as f:
         # Header
         f.write("# Branch Changes Analysis\n\n")
         f.write(f"**Base**: {base_ref} (commit {base_commit_short})\n")
@@ -350,96 +527,68 @@ def generate_markdown_report(base_ref: str, base_commit: str, files: list[dict],
         f.write(f"- Files changed: {total_files} ({', '.join(summary_parts)})\n")
 
         # Get line statistics
-        output, code = run_git_command(["git", "diff", "--shortstat", f"{base_commit}..HEAD"])
+        output, code = shortstat_future.result()
         if code == 0 and output:
             f.write(f"- {output}\n")
 
-        # Changes by directory
-        if len(file_groups) > 1:
-            f.write("\n## Changes by Directory\n\n")
-            for directory, dir_files in sorted(file_groups.items()):
-                f.write(f"### `{directory}/` ({len(dir_files)} files)\n")
-
-        # File changes
+        # File changes, one section per directory
         f.write("\n## File Changes\n\n")
 
-        for file_info in files:
-            filepath = file_info["path"]
-            status = file_info["status"]
+        for directory, dir_files in sorted(file_groups.items()):
+            f.write(f"### `{directory}/` ({len(dir_files)} files)\n\n")
 
-            # Handle renamed files
-            if " → " in filepath:
-                old_path, new_path = filepath.split(" → ")
-                f.write(f"### `{old_path}` → `{new_path}` ({status})\n\n")
-                actual_filepath = new_path
-            else:
-                f.write(f"### `{filepath}` ({status})\n\n")
-                actual_filepath = filepath
-
-            # Skip deleted files (no content to show)
-            if status == "Deleted":
-                f.write("*File was deleted*\n\n")
-                continue
-
-                # Check if binary
-            if is_binary_file(actual_filepath, base_commit):
-                binary_files.append(actual_filepath)
-                f.write("*Binary file (contents not shown)*\n\n")
-                continue
-
-            # Check if file should be skipped (lockfiles, etc.)
-            if should_skip_file(actual_filepath):
-                f.write("*Auto-generated file (skipped for brevity)*\n\n")
-                continue
-
-            # For new files, show content directly without diff markers
-            if status == "Added":
-                file_content = get_file_content(actual_filepath)
-                if file_content:
-                    # Get file extension for syntax highlighting
-                    ext = Path(actual_filepath).suffix.lower()
-                    lang_map = {
-                        ".py": "python",
-                        ".js": "javascript",
-                        ".ts": "typescript",
-                        ".jsx": "jsx",
-                        ".tsx": "tsx",
-                        ".java": "java",
-                        ".cpp": "cpp",
-                        ".c": "c",
-                        ".h": "c",
-                        ".rs": "rust",
-                        ".go": "go",
-                        ".rb": "ruby",
-                        ".php": "php",
-                        ".sh": "bash",
-                        ".sql": "sql",
-                        ".md": "markdown",
-                        ".yaml": "yaml",
-                        ".yml": "yaml",
-                        ".json": "json",
-                        ".xml": "xml",
-                        ".html": "html",
-                        ".css": "css",
-                        ".scss": "scss",
-                        ".tf": "hcl",
-                    }
-                    language = lang_map.get(ext, "")
-                    f.write(f"```{language}\n{file_content}\n```\n\n")
+            for file_info in dir_files:
+                status = file_info["status"]
+                actual_filepath = file_info["actual_path"]
+
+                # Handle renamed files
+                if status == "Renamed":
+                    f.write(f"#### `{file_info['old_path']}` → `{actual_filepath}` ({status})\n\n")
                 else:
-                    f.write("*Could not read file content*\n\n")
-            else:
-                # Get and format diff for modified files
-                diff_output = get_file_diff(actual_filepath, base_commit)
-                if diff_output:
-                    formatted_diff = format_diff_for_markdown(diff_output, actual_filepath)
-                    if formatted_diff:
-                        f.write(formatted_diff)
+                    f.write(f"#### `{actual_filepath}` ({status})\n\n")
+
+                # Skip deleted files (no content to show)
+                if status == "Deleted":
+                    f.write("*File was deleted*\n\n")
+                    continue
+
+                # Check if file should be skipped (lockfiles, etc.) before the costlier binary check
+                if should_skip_file(actual_filepath):
+                    f.write("*Auto-generated file (skipped for brevity)*\n\n")
+                    continue
+
+                # New files are shown from the working tree; note the ones whose content can't be inlined
+                if status == "Added" and not file_info["binary"]:
+                    stub = _added_file_stub(actual_filepath, max_file_size)
+                    if stub:
+                        f.write(f"{stub}\n\n")
+                        continue
+
+                # Check if binary. New files are shown from the working tree, so sniff that copy as well
+                if file_info["binary"] or (status == "Added" and _sniff_binary(actual_filepath)):
+                    binary_files.append(actual_filepath)
+                    f.write("*Binary file (contents not shown)*\n\n")
+                    continue
+
+                # For new files, show content directly without diff markers
+                if status == "Added":
+                    if _emit_added_file(actual_filepath, f):
                         f.write("\n\n")
                     else:
-                        f.write("*No diff available*\n\n")
+                        f.write("*Could not read file content*\n\n")
+                elif file_info["too_large"]:
+                    added, deleted = file_info["added"], file_info["deleted"]
+                    f.write(f"*Diff too large (+{added} -{deleted} lines); showing summary only*\n\n")
                 else:
-                    f.write("*Could not generate diff*\n\n")
+                    # Get and format diff for modified files
+                    patch = file_info["patch"]
+                    if patch:
+                        if format_diff_for_markdown(read_patch(patch), actual_filepath, f):
+                            f.write("\n\n")
+                        else:
+                            f.write("*No diff available*\n\n")
+                    else:
+                        f.write("*Could not generate diff*\n\n")
 
         # Binary files summary
         if binary_files:
@@ -458,6 +607,18 @@ def main():
     parser.add_argument("--base", help="Base branch name (e.g., main, master)")
     parser.add_argument("--base-commit", help="Base commit hash to compare against")
     parser.add_argument("--output", default="changes.md", help="Output markdown file (default: changes.md)")
+    parser.add_argument(
+        "--max-diff-lines",
+        type=int,
+        default=3000,
+        help="Show only a summary for diffs changing more lines than this (default: 3000, 0 for no limit)",
+    )
+    parser.add_argument(
+        "--max-file-size",
+        type=int,
+        default=1_000_000,
+        help="Don't inline new files larger than this many bytes (default: 1000000, 0 for no limit)",
+    )
 
     args = parser.parse_args()
 
@@ -484,8 +645,14 @@ def main():
             sys.exit(1)
         base_ref = args.base
     else:
-        # Try to auto-detect base branch
-        for branch in ["main", "master", "develop"]:
+        # Try to auto-detect base branch, asking git once which of the candidates exist locally.
+        # If none do, fall back to trying each name (it may still resolve, e.g. as a tag)
+        candidates = ["main", "master", "develop"]
+        output, _ = run_git_command(
+            ["git", "for-each-ref", "--format=%(refname:short)", *(f"refs/heads/{branch}" for branch in candidates)]
+        )
+        existing = set(output.splitlines())
+        for branch in [branch for branch in candidates if branch in existing] or candidates:
             base_commit = get_merge_base(branch)
             if base_commit:
                 base_ref = branch
@@ -498,14 +665,14 @@ def main():
         print(f"Auto-detected base branch: {base_ref}")
 
     # Get file changes
-    files, stats = get_file_changes(base_commit)
+    files, stats = get_file_changes(base_commit, args.max_diff_lines)
 
     if not files:
         print("No changes found between base and HEAD")
         sys.exit(0)
 
     # Generate report
-    generate_markdown_report(base_ref, base_commit, files, stats, args.output)
+    generate_markdown_report(base_ref, base_commit, files, stats, args.output, args.max_file_size)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pr2md_a  # noqa: E402
+
+
+def git(*args):
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args], check=True)
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    git("init", "-q", "-b", "main")
+    git("commit", "-q", "--allow-empty", "-m", "base")
+    git("checkout", "-q", "-b", "feature")
+    Path("mod.py").write_text("print('hi')\n")
+    git("add", "mod.py")
+    git("commit", "-q", "-m", "add mod.py")
+
+    gen = pr2md_a.PRSummaryGenerator(base_ref="main", current_ref="feature", output_file=str(tmp_path / "out.md"))
+    yield gen
+    gen.close()
+
+
+def test_read_blobs_missing_path_with_space(generator):
+    # cat-file echoes the name back ("feature:no such.txt missing"), so the reply has three tokens
+    blobs = list(generator._read_blobs("feature", ["mod.py", "no such.txt", "mod.py"]))
+
+    assert blobs[0].data == b"print('hi')\n"
+    assert blobs[1] is None
+    assert blobs[2].data == b"print('hi')\n"
+
+
+def test_read_blob_missing_undecodable_path(generator):
+    with pytest.raises(pr2md_a.GitError):
+        generator._read_blob("feature", os.fsdecode(b"caf\xe9 x.txt"))
+
+    # The stream is still aligned afterwards
+    assert generator._read_blob("feature", "mod.py").data == b"print('hi')\n"